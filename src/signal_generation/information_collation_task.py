@@ -1,15 +1,44 @@
-from typing import List, Dict
-from collections import defaultdict
+from typing import List
 
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 from src.schemas import INPUT_FIELDS
 from src.signal_generation.load_feed import FeedLoader
 
 PICKLE_DIRECTORY = "notebooks/pickled_feeds"
 
+# OVERVIEW feed keys -> signal columns, kept as text
+_FUNDAMENTAL_TEXT_FIELDS = {
+    "Industry": INPUT_FIELDS.industry,
+    "TrailingPE": INPUT_FIELDS.trailing_pe,
+    "ForwardPE": INPUT_FIELDS.forward_pe,
+}
+# strong buy .. strong sell counts, weighted +2 .. -2 and averaged over all ratings
+_ANALYST_RATING_FIELDS = [
+    "AnalystRatingStrongBuy",
+    "AnalystRatingBuy",
+    "AnalystRatingHold",
+    "AnalystRatingSell",
+    "AnalystRatingStrongSell",
+]
+_ANALYST_RATING_WEIGHTS = np.array([2, 1, 0, -1, -2])
+_ANALYST_SCORES = _ANALYST_RATING_WEIGHTS.reshape(-1, 1)
+
+# sentiment bucket edges (bearish -> bullish): [-0.35, -0.15) is small sell, [-0.15, 0.15] hold and
+# (0.15, 0.35] small buy, i.e. edges below zero are left-closed and edges above zero right-closed
+_SENTIMENT_BEARISH_EDGES = np.array([-0.35, -0.15])
+_SENTIMENT_BULLISH_EDGES = np.array([0.15, 0.35])
+
+# mean running STDDEV cut-offs between full, half and quarter window holding periods
+_VOLATILITY_THRESHOLDS = np.array([0.02, 0.05])
+
+# direction/conviction per analyst score (+2 .. -2) and per sentiment bucket (bearish -> bullish)
+_ANALYST_DIRECTIONS = np.array(["buy", "buy", "hold", "sell", "sell"], dtype=object)
+_ANALYST_CONVICTIONS = np.array(["strong", "small", "strong", "small", "strong"], dtype=object)
+_SENTIMENT_DIRECTIONS = np.array(["sell", "sell", "hold", "buy", "buy"], dtype=object)
+_SENTIMENT_CONVICTIONS = np.array(["strong", "small", "strong", "small", "strong"], dtype=object)
+
 
 class InformationCollationPipeline:
     
@@ -17,21 +46,8 @@ class InformationCollationPipeline:
         self.api_key = api_key
         self.tickers = tickers
 
-        self.signals_df = pd.DataFrame(columns=[
-            INPUT_FIELDS.ticker,
-            INPUT_FIELDS.industry,
-            INPUT_FIELDS.trailing_pe,
-            INPUT_FIELDS.forward_pe,
-            INPUT_FIELDS.analyst_direction,
-            INPUT_FIELDS.analyst_target_price,
-            INPUT_FIELDS.sentiment_score,
-            INPUT_FIELDS.sentiment_direction,
-            INPUT_FIELDS.sentiment_conviction,
-            INPUT_FIELDS.execution_time,
-            INPUT_FIELDS.valid_period,
-        ])
-        self.signals_df[INPUT_FIELDS.ticker] = pd.Series(tickers)
-        self.signals_df.set_index(INPUT_FIELDS.ticker, inplace=True)
+        # signal columns are added by the process_* stages as they are computed
+        self.signals_df = pd.DataFrame(index=pd.Index(tickers, name=INPUT_FIELDS.ticker))
 
         self.loader = FeedLoader(api_key, pickle_dir=PICKLE_DIRECTORY)
 
@@ -41,225 +57,98 @@ class InformationCollationPipeline:
         self.process_analytics()
 
     def process_analytics(self) -> None:
+        window_size = 20  # trading days
         feed_json = self.loader.load_window_analytics(
             self.tickers,
             n_month=12,
             calculations=["STDDEV"],
-            window=20,
+            window=window_size,
             interval="DAILY"
         )
         
-        self.signals_df.reset_index(inplace=True)
-        self.signals_df[INPUT_FIELDS.valid_period] = self.signals_df[INPUT_FIELDS.ticker].apply(
-            lambda x: self._scrape_window_analytics_feed(feed_json, ticker=x, window_size=20)
+        running_stddev = feed_json["STDDEV"]['payload']['RETURNS_CALCULATIONS']["STDDEV"]["RUNNING_STDDEV"]
+        mean_window_var_in_period = np.array([
+            np.fromiter(running_stddev[ticker].values(), dtype=np.float64, count=len(running_stddev[ticker])).mean()
+            if running_stddev.get(ticker) else np.nan
+            for ticker in self.signals_df.index
+        ])
+
+        # low volatility = hold for window length, high volatility = hold for << window length
+        volatility_bucket = np.searchsorted(_VOLATILITY_THRESHOLDS, mean_window_var_in_period, side="right")
+        valid_periods = np.array([window_size, window_size // 2, window_size // 4], dtype=np.float64)
+        self.signals_df[INPUT_FIELDS.valid_period] = np.where(
+            np.isnan(mean_window_var_in_period), np.nan, valid_periods[volatility_bucket]
         )
-        self.signals_df.set_index(INPUT_FIELDS.ticker, inplace=True)
 
     def process_fundamentals(self) -> None:
         feed_json = self.loader.load_fundamentals(self.tickers)
 
-        self.signals_df.reset_index(inplace=True)
-        self.signals_df[[
-            INPUT_FIELDS.industry,
-            INPUT_FIELDS.trailing_pe,
-            INPUT_FIELDS.forward_pe,
-            INPUT_FIELDS.analyst_target_price,
-            '_AnalystRatingStrongBuy', 
-            '_AnalystRatingBuy', 
-            '_AnalystRatingHold', 
-            '_AnalystRatingSell', 
-            '_AnalystRatingStrongSell',
-        ]] = self.signals_df.apply(
-            lambda row: self._scrape_fundamental_feed(feed_json, row=row),
-            axis = 1,
+        fundamentals_df = pd.DataFrame.from_dict(feed_json, orient="index").reindex(
+            index=self.signals_df.index,
+            columns=[*_FUNDAMENTAL_TEXT_FIELDS, "AnalystTargetPrice", *_ANALYST_RATING_FIELDS],
         )
-        self.signals_df.set_index(INPUT_FIELDS.ticker, inplace=True)
 
-        self.signals_df[[
-            INPUT_FIELDS.analyst_direction,
-            INPUT_FIELDS.analyst_conviction,
-        ]] = (
-            (
-                self.signals_df['_AnalystRatingStrongBuy'] * 2
-                + self.signals_df['_AnalystRatingBuy'] * 1
-                + self.signals_df['_AnalystRatingHold'] * 0
-                + self.signals_df['_AnalystRatingSell'] * -1
-                + self.signals_df['_AnalystRatingStrongSell'] * -2
-            ) / (
-                self.signals_df['_AnalystRatingStrongBuy']
-                + self.signals_df['_AnalystRatingBuy']
-                + self.signals_df['_AnalystRatingHold']
-                + self.signals_df['_AnalystRatingSell']
-                + self.signals_df['_AnalystRatingStrongSell']
-            )
-        ).apply(lambda x: self._convert_analyst_score(x))
+        text_fields = fundamentals_df[list(_FUNDAMENTAL_TEXT_FIELDS)]
+        self.signals_df[list(_FUNDAMENTAL_TEXT_FIELDS.values())] = text_fields.astype(str).mask(text_fields.isna())
+        self.signals_df[INPUT_FIELDS.analyst_target_price] = pd.to_numeric(
+            fundamentals_df["AnalystTargetPrice"], errors="coerce"
+        )
+
+        ratings = (
+            fundamentals_df[_ANALYST_RATING_FIELDS]
+            .apply(pd.to_numeric, errors="coerce")
+            .to_numpy(dtype=np.float64)
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            analyst_ratio = ratings @ _ANALYST_RATING_WEIGHTS / ratings.sum(axis=1)
 
-        self.signals_df.drop(columns=[
-            '_AnalystRatingStrongBuy', 
-            '_AnalystRatingBuy', 
-            '_AnalystRatingHold', 
-            '_AnalystRatingSell', 
-            '_AnalystRatingStrongSell',
-        ], inplace=True)
+        score = np.round(analyst_ratio, 0)
+        conditions = list(score == _ANALYST_SCORES)
+        self.signals_df[INPUT_FIELDS.analyst_direction] = np.select(conditions, _ANALYST_DIRECTIONS, default=None)
+        self.signals_df[INPUT_FIELDS.analyst_conviction] = np.select(conditions, _ANALYST_CONVICTIONS, default=None)
 
     def process_sentiment(self) -> None:
         feed_json = self.loader.load_news_sentiment(self.tickers)
         
-        self.signals_df["_news_occurences"] = self._scrape_sentiment_feed(feed_json)
-        self.signals_df[["_all_sentiment_scores", "_all_relevance_scores"]] = self.signals_df.apply(
-            lambda row: self._collect_sentiment_scores(feed_json, row),
-            axis=1,
+        ticker_ids = {ticker: i for i, ticker in enumerate(self.signals_df.index.unique())}
+        # flatten the universe's mentions once, then lay them out column-wise as typed arrays
+        mentions = [
+            ticker_dict
+            for article_dict in feed_json["feed"]
+            for ticker_dict in article_dict["ticker_sentiment"]
+            if ticker_dict["ticker"] in ticker_ids
+        ]
+        ticker_idx = np.fromiter(
+            (ticker_ids[ticker_dict["ticker"]] for ticker_dict in mentions), dtype=np.intp, count=len(mentions)
         )
-
-        self.signals_df[INPUT_FIELDS.sentiment_score] = self._aggregate_scores(self.signals_df)
-        self.signals_df[[INPUT_FIELDS.sentiment_direction, INPUT_FIELDS.sentiment_conviction]] = (
-            self.signals_df[INPUT_FIELDS.sentiment_score]
-            .dropna()
-            .apply(self._convert_sentiment_score)
+        sentiment_scores = np.fromiter(
+            (ticker_dict["ticker_sentiment_score"] for ticker_dict in mentions), dtype=np.float64, count=len(mentions)
+        )
+        relevance_scores = np.fromiter(
+            (ticker_dict["relevance_score"] for ticker_dict in mentions), dtype=np.float64, count=len(mentions)
         )
 
-        self.signals_df.drop(columns=[
-            "_news_occurences",
-            "_all_sentiment_scores",
-            "_all_relevance_scores",
-        ], inplace=True)
-
-    @staticmethod
-    def _scrape_fundamental_feed(feed_json: Dict[str, dict], row: pd.Series) -> pd.Series:
-        ticker = row[INPUT_FIELDS.ticker]
-        if feed_json.get(ticker, None):
-            _dict = feed_json[ticker]
-            return pd.Series(
-                {
-                    INPUT_FIELDS.industry: str(_dict["Industry"]),
-                    INPUT_FIELDS.trailing_pe: str(_dict["TrailingPE"]),
-                    INPUT_FIELDS.forward_pe: str(_dict["ForwardPE"]),
-                    INPUT_FIELDS.analyst_target_price: float(_dict['AnalystTargetPrice']),
-                    '_AnalystRatingStrongBuy': int(_dict['AnalystRatingStrongBuy']), 
-                    '_AnalystRatingBuy': int(_dict['AnalystRatingBuy']),
-                    '_AnalystRatingHold': int(_dict['AnalystRatingHold']),
-                    '_AnalystRatingSell': int(_dict['AnalystRatingSell']),
-                    '_AnalystRatingStrongSell': int(_dict['AnalystRatingStrongSell']),
-                }
-            )
-        else: 
-            return pd.Series(
-                {
-                    INPUT_FIELDS.industry: None,
-                    INPUT_FIELDS.trailing_pe: None,
-                    INPUT_FIELDS.forward_pe: None,
-                    INPUT_FIELDS.analyst_target_price: None,
-                    '_AnalystRatingStrongBuy': None,
-                    '_AnalystRatingBuy': None,
-                    '_AnalystRatingHold': None,
-                    '_AnalystRatingSell': None,
-                    '_AnalystRatingStrongSell': None,
-                }
-            )
-        
-    @staticmethod
-    def _scrape_window_analytics_feed(feed_json: Dict[str, dict], ticker: str, window_size) -> pd.Series:
-        if not (
-            feed_json["STDDEV"]['payload']['RETURNS_CALCULATIONS']["STDDEV"]["RUNNING_STDDEV"]
-            .get(ticker, None)
-        ):
-            return None
-        
-        mean_window_var_in_period = np.mean(list(
-            feed_json["STDDEV"]['payload']['RETURNS_CALCULATIONS']["STDDEV"]["RUNNING_STDDEV"][ticker].values()
-        ))
-
-        # low volatility = hold for window length
-        if mean_window_var_in_period < 0.02:
-            valid_period = window_size  # trading days
-
-        elif mean_window_var_in_period < 0.05:
-            valid_period = window_size // 2
-
-        # high volatility = hold for << window length
-        else:
-            valid_period = window_size // 4
-
-        return valid_period
-    
-    @staticmethod
-    def _scrape_sentiment_feed(feed_json: Dict[str, dict]) -> pd.Series:
-        ticker_occurrences = defaultdict(list)
-        for i, article_dict in enumerate(tqdm(feed_json["feed"])):
-            for ticker_dict in article_dict["ticker_sentiment"]:
-                ticker = ticker_dict["ticker"]
-                ticker_occurrences[ticker].append(i)
-
-        occurrences_series = pd.Series(ticker_occurrences, name="_news_occurences", dtype=object)
-        return occurrences_series
-    
-    @staticmethod
-    def _collect_sentiment_scores(feed_json: Dict[str, dict], row: pd.Series) -> pd.Series:
-        tot_sentiment = []
-        tot_relevance = []
-
-        occurrences = row["_news_occurences"]
-        if not isinstance(occurrences, list):
-            occurrences = []
+        # relevance-weighted mean sentiment per ticker, NaN where there is no relevance to weight by
+        weighted_sentiment = np.bincount(ticker_idx, weights=sentiment_scores * relevance_scores, minlength=len(ticker_ids))
+        total_relevance = np.bincount(ticker_idx, weights=relevance_scores, minlength=len(ticker_ids))
+        sentiment_score = np.divide(
+            weighted_sentiment,
+            total_relevance,
+            out=np.full(len(ticker_ids), np.nan),
+            where=total_relevance > 0,
+        )[[ticker_ids[ticker] for ticker in self.signals_df.index]]
+        self.signals_df[INPUT_FIELDS.sentiment_score] = sentiment_score
+
+        scored = ~np.isnan(sentiment_score)
+        codes = (
+            np.searchsorted(_SENTIMENT_BEARISH_EDGES, sentiment_score[scored], side="right")
+            + np.searchsorted(_SENTIMENT_BULLISH_EDGES, sentiment_score[scored], side="left")
+        )
 
-        for i in occurrences:
-            for ticker_dict in feed_json["feed"][i]["ticker_sentiment"]:
-                if row.name == ticker_dict["ticker"]:
-                    tot_sentiment += [float(ticker_dict["ticker_sentiment_score"])]
-                    tot_relevance += [float(ticker_dict["relevance_score"])]
+        directions = np.full(len(sentiment_score), None, dtype=object)
+        convictions = np.full(len(sentiment_score), None, dtype=object)
+        directions[scored] = _SENTIMENT_DIRECTIONS[codes]
+        convictions[scored] = _SENTIMENT_CONVICTIONS[codes]
 
-        return pd.Series({
-            "_all_sentiment_scores": tot_sentiment,
-            "_all_relevance_scores": tot_relevance
-        })
-    
-    @staticmethod
-    def _aggregate_scores(row: pd.Series) -> pd.Series:
-        df_exploded: pd.DataFrame = (
-            row
-            .explode(["_all_sentiment_scores", "_all_relevance_scores"])
-        )
-        df_exploded = (
-            df_exploded
-            .assign(**{
-                "_weighted_sentiment": lambda x: x["_all_sentiment_scores"] * x["_all_relevance_scores"]
-            })
-            .reset_index()
-            .groupby(INPUT_FIELDS.ticker)
-            [["_weighted_sentiment", "_all_relevance_scores"]]
-            .sum()
-            .replace({0: None})
-            .dropna()
-        )
-        return df_exploded["_weighted_sentiment"].divide(df_exploded["_all_relevance_scores"])
-    
-    @staticmethod
-    def _convert_sentiment_score(sentiment_score: float) -> pd.Series:
-        
-        if sentiment_score > 0.35:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "buy", INPUT_FIELDS.sentiment_conviction: "strong"})
-        elif 0.15 < sentiment_score <= 0.35:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "buy", INPUT_FIELDS.sentiment_conviction: "small"})
-        elif -0.15 <= sentiment_score <= 0.15:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "hold", INPUT_FIELDS.sentiment_conviction: "strong"})
-        elif -0.35 <= sentiment_score < -0.15:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "sell", INPUT_FIELDS.sentiment_conviction: "small"})
-        else:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "sell", INPUT_FIELDS.sentiment_conviction: "strong"})
-        
-    @staticmethod
-    def _convert_analyst_score(sentiment_score: float) -> pd.Series:
-        
-        score = round(sentiment_score, 0)
-        if score == 2:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "buy", INPUT_FIELDS.sentiment_conviction: "strong"})
-        elif score == 1:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "buy", INPUT_FIELDS.sentiment_conviction: "small"})
-        elif score == 0:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "hold", INPUT_FIELDS.sentiment_conviction: "strong"})
-        elif score == -1:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "sell", INPUT_FIELDS.sentiment_conviction: "small"})
-        elif score == 0:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: "sell", INPUT_FIELDS.sentiment_conviction: "strong"})
-        else:
-            return pd.Series({INPUT_FIELDS.sentiment_direction: None, INPUT_FIELDS.sentiment_conviction: None})
\ No newline at end of file
+        self.signals_df[INPUT_FIELDS.sentiment_direction] = directions
+        self.signals_df[INPUT_FIELDS.sentiment_conviction] = convictions
@@ -1,7 +1,10 @@
-from typing import List, Dict, Optional
+from typing import Callable, Hashable, List, Dict, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pickle
 import os
 
@@ -15,6 +18,7 @@ class FeedLoader:
     ):
         self.api_key = api_key
         self.pickle_dir = pickle_dir
+        self._feed_cache: Dict[Tuple[Hashable, ...], Dict[str, dict]] = {}
 
         if not self.api_key:
             if self.pickle_dir:
@@ -31,61 +35,25 @@ class FeedLoader:
                 self.save_locally = False
 
     def load_news_sentiment(self, tickers: List[str]) -> Dict[str, dict]:
-        if not self.load_locally:
-            feed = APIs.get_news_sentiment(self.api_key, tickers=tickers)
-            
-            if self.save_locally:
-                with open(
-                    os.path.join(self.pickle_dir, "news_sentiment.pkl"), "wb"
-                ) as f:
-                    pickle.dump(feed, f)
-
-            return feed
-        
-        with open(
-            os.path.join(self.pickle_dir, "news_sentiment.pkl"), "rb"
-        ) as f:
-            feed = pickle.load(f)
-
-        return feed
+        return self._load_feed(
+            "news_sentiment.pkl",
+            cache_key=("news_sentiment", tuple(sorted(tickers))),
+            fetch=lambda: APIs.get_news_sentiment(self.api_key, tickers=tickers),
+        )
     
     def load_fundamentals(self, tickers: List[str]) -> Dict[str, dict]:
-        if not self.load_locally:
-            feed = APIs.get_fundamentals(self.api_key, tickers=tickers)
-            
-            if self.save_locally:
-                with open(
-                    os.path.join(self.pickle_dir, "fundamentals.pkl"), "wb"
-                ) as f:
-                    pickle.dump(feed, f)
-
-            return feed
-        
-        with open(
-            os.path.join(self.pickle_dir, "fundamentals.pkl"), "rb"
-        ) as f:
-            feed = pickle.load(f)
-
-        return feed
+        return self._load_feed(
+            "fundamentals.pkl",
+            cache_key=("fundamentals", tuple(sorted(tickers))),
+            fetch=lambda: APIs.get_fundamentals(self.api_key, tickers=tickers),
+        )
     
     def load_insider_moves(self, tickers: List[str]) -> Dict[str, dict]:
-        if not self.load_locally:
-            feed = APIs.get_insider_moves(self.api_key, tickers=tickers)
-            
-            if self.save_locally:
-                with open(
-                    os.path.join(self.pickle_dir, "insider_moves.pkl"), "wb"
-                ) as f:
-                    pickle.dump(feed, f)
-
-            return feed
-        
-        with open(
-            os.path.join(self.pickle_dir, "insider_moves.pkl"), "rb"
-        ) as f:
-            feed = pickle.load(f)
-
-        return feed
+        return self._load_feed(
+            "insider_moves.pkl",
+            cache_key=("insider_moves", tuple(sorted(tickers))),
+            fetch=lambda: APIs.get_insider_moves(self.api_key, tickers=tickers),
+        )
     
     def load_indicator(
         self, 
@@ -95,29 +63,17 @@ class FeedLoader:
         time_period: int = 14,
     ) -> Dict[str, dict]:
         
-        if not self.load_locally:
-            feed = APIs.get_technical_indicator(
+        return self._load_feed(
+            f"{indicator.lower()}_feed.pkl",
+            cache_key=("indicator", tuple(sorted(tickers)), indicator, interval, time_period),
+            fetch=lambda: APIs.get_technical_indicator(
                 self.api_key, 
                 tickers=tickers,
                 indicator=indicator,
                 interval=interval,
                 time_period=time_period,
-            )
-            
-            if self.save_locally:
-                with open(
-                    os.path.join(self.pickle_dir, f"{indicator.lower()}_feed.pkl"), "wb"
-                ) as f:
-                    pickle.dump(feed, f)
-
-            return feed
-        
-        with open(
-            os.path.join(self.pickle_dir, f"{indicator.lower()}_feed.pkl"), "rb"
-        ) as f:
-            feed = pickle.load(f)
-
-        return feed
+            ),
+        )
     
     def load_window_analytics(
         self, 
@@ -128,35 +84,66 @@ class FeedLoader:
         interval: str = "DAILY",
     ) -> Dict[str, dict]:
         
-        if not self.load_locally:
-            feed = APIs.get_window_analytics(
+        return self._load_feed(
+            "sliding_window_analytics.pkl",
+            cache_key=(
+                "window_analytics", tuple(sorted(tickers)), n_month, tuple(sorted(calculations)), window, interval
+            ),
+            fetch=lambda: APIs.get_window_analytics(
                 self.api_key, 
                 tickers=tickers,
                 n_month=n_month,
                 calculations=calculations,
                 window=window,
                 interval=interval,
-            )
-            
+            ),
+        )
+
+    def _load_feed(
+        self,
+        file_name: str,
+        cache_key: Tuple[Hashable, ...],
+        fetch: Callable[[], Dict[str, dict]],
+    ) -> Dict[str, dict]:
+        """
+        Helper function for returning a feed already loaded by this instance, otherwise fetching it
+        from the API (pickling it if a directory was given) or unpickling it from the pickle directory
+        """
+        if cache_key in self._feed_cache:
+            return self._feed_cache[cache_key]
+
+        if not self.load_locally:
+            feed = fetch()
+
             if self.save_locally:
                 with open(
-                    os.path.join(self.pickle_dir, "sliding_window_analytics.pkl"), "wb"
+                    os.path.join(self.pickle_dir, file_name), "wb"
                 ) as f:
-                    pickle.dump(feed, f)
+                    pickle.dump(feed, f, protocol=pickle.HIGHEST_PROTOCOL)
 
-            return feed
-        
-        with open(
-            os.path.join(self.pickle_dir, "sliding_window_analytics.pkl"), "rb"
-        ) as f:
-            feed = pickle.load(f)
+        else:
+            with open(
+                os.path.join(self.pickle_dir, file_name), "rb"
+            ) as f:
+                feed = pickle.load(f)
 
+        self._feed_cache[cache_key] = feed
         return feed
 
 
 class APIs:
 
     base_url = "https://www.alphavantage.co/query"
+    max_concurrent_requests = 32  # in-flight per-symbol requests, one pooled connection each
+    request_timeout = 30  # seconds
+
+    # shared across every call (and thread) so TCP/TLS connections are kept alive and reused
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=max_concurrent_requests,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
 
     @staticmethod
     def _get_comma_seperated(_list: List[str]):
@@ -171,6 +158,32 @@ class APIs:
             raise ReferenceError(f"Need to specify at least one item. Received {_list}.")
         return _list
 
+    @staticmethod
+    def _get(params: dict) -> Dict[str, dict]:
+        """
+        Helper function for a single GET against the API through the shared session
+        """
+        return APIs.session.get(APIs.base_url, params=params, timeout=APIs.request_timeout).json()
+
+    @staticmethod
+    def _get_per_ticker(tickers: List[str], get_params: Callable[[str], dict]) -> Dict[str, dict]:
+        """
+        Helper function for fanning a per-symbol endpoint out over a thread pool
+        """
+        output = defaultdict(dict)
+        if not tickers:
+            return output
+
+        with ThreadPoolExecutor(max_workers=min(APIs.max_concurrent_requests, len(tickers))) as executor:
+            futures = {
+                ticker: executor.submit(APIs._get, get_params(ticker))
+                for ticker in tickers
+            }
+            for ticker, future in futures.items():
+                output[ticker] = future.result()
+
+        return output
+
     @staticmethod
     def get_news_sentiment(api: str, tickers: List[str]) -> Dict[str, dict]:
         """
@@ -218,7 +231,7 @@ class APIs:
             "symbol": tickers,
             "function": "NEWS_SENTIMENT"
         }
-        return requests.get(APIs.base_url, params=params).json()
+        return APIs._get(params)
 
     @staticmethod
     def get_insider_moves(api: str, tickers: List[str]) -> Dict[str, dict]:
@@ -249,7 +262,7 @@ class APIs:
             "symbol": tickers,
             "function": "INSIDER_TRANSACTIONS"
         }
-        return requests.get(APIs.base_url, params=params).json()
+        return APIs._get(params)
 
     @staticmethod
     def get_window_analytics(
@@ -300,7 +313,7 @@ class APIs:
             "apikey": api,
             "function": "ANALYTICS_SLIDING_WINDOW",
         }
-        return requests.get(APIs.base_url, params=params).json()
+        return APIs._get(params)
     
     @staticmethod
     def get_technical_indicator(
@@ -334,18 +347,17 @@ class APIs:
             }
         }
         """
-        output = defaultdict(dict)
-        for ticker in tickers:
-            params = {
+        return APIs._get_per_ticker(
+            tickers,
+            lambda ticker: {
                 "function": indicator,
                 "symbol": ticker,
                 "interval": interval,
                 "time_period": time_period,
                 "series_type": "close",
                 "apikey": api,
-            }
-            output[ticker] = requests.get(APIs.base_url, params=params).json()
-        return output
+            },
+        )
 
     @staticmethod
     def get_fundamentals(api: str, tickers: List[str]) -> Dict[str, dict]:
@@ -401,15 +413,11 @@ class APIs:
             "ExDividendDate": "2025-03-30"
         }
         """
-        output = defaultdict(dict)
-
-        for ticker in tickers:
-            params = {
+        return APIs._get_per_ticker(
+            tickers,
+            lambda ticker: {
                 "function": "OVERVIEW",
                 "symbol": ticker,
                 "apikey": api,
-            }
-            ticker_feed = requests.get(APIs.base_url, params=params).json()
-            output[ticker] = ticker_feed
-        
-        return output
\ No newline at end of file
+            },
+        )
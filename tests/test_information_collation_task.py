@@ -0,0 +1,57 @@
+import pytest
+
+from src.schemas import INPUT_FIELDS
+from src.signal_generation.information_collation_task import InformationCollationPipeline
+
+
+def _run_sentiment(ticker_scores):
+    pipeline = InformationCollationPipeline(api_key=None, tickers=list(ticker_scores))
+    pipeline.loader.load_news_sentiment = lambda tickers: {
+        "feed": [
+            {
+                "ticker_sentiment": [
+                    {"ticker": ticker, "ticker_sentiment_score": score, "relevance_score": "1.0"}
+                ]
+            }
+            for ticker, score in ticker_scores.items()
+        ]
+    }
+    pipeline.process_sentiment()
+    return pipeline.signals_df
+
+
+@pytest.mark.parametrize(
+    "score, direction, conviction",
+    [
+        ("-0.5", "sell", "strong"),
+        ("-0.35", "sell", "small"),
+        ("-0.2", "sell", "small"),
+        ("-0.15", "hold", "strong"),
+        ("0.15", "hold", "strong"),
+        ("0.2", "buy", "small"),
+        ("0.35", "buy", "small"),
+        ("0.5", "buy", "strong"),
+    ],
+)
+def test_sentiment_bucket_edges(score, direction, conviction):
+    signals_df = _run_sentiment({"TSLA": score})
+
+    assert signals_df.loc["TSLA", INPUT_FIELDS.sentiment_direction] == direction
+    assert signals_df.loc["TSLA", INPUT_FIELDS.sentiment_conviction] == conviction
+
+
+def test_unmentioned_ticker_is_unscored():
+    pipeline = InformationCollationPipeline(api_key=None, tickers=["TSLA", "IBM"])
+    pipeline.loader.load_news_sentiment = lambda tickers: {"feed": []}
+    pipeline.process_sentiment()
+
+    assert pipeline.signals_df[INPUT_FIELDS.sentiment_score].isna().all()
+    assert pipeline.signals_df[INPUT_FIELDS.sentiment_direction].isna().all()
+
+
+def test_zero_weighted_sentiment_is_scored_as_hold():
+    signals_df = _run_sentiment({"TSLA": "0.000000"})
+
+    assert signals_df.loc["TSLA", INPUT_FIELDS.sentiment_score] == 0.0
+    assert signals_df.loc["TSLA", INPUT_FIELDS.sentiment_direction] == "hold"
+    assert signals_df.loc["TSLA", INPUT_FIELDS.sentiment_conviction] == "strong"